@@ -0,0 +1,253 @@
+import os
+import time
+import asyncio
+import logging
+import xml.etree.ElementTree as ET
+from importlib.util import find_spec
+import httpx
+
+try:
+    import diskcache
+except ImportError:
+    diskcache = None
+
+logger = logging.getLogger("scholarfinder_logger")
+
+ESEARCH_URL = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils/esearch.fcgi"
+
+# Optional NCBI API key; raises the E-utilities rate limit
+NCBI_API_KEY = os.getenv("NCBI_API_KEY", "")
+
+# E-utilities requests per second allowed with and without an API key
+MAX_REQUESTS_PER_SECOND = 10
+MAX_REQUESTS_PER_SECOND_NO_KEY = 3
+
+# HTTP/2 multiplexes the concurrent ESearch calls over one connection; it needs the optional h2 package
+HTTP2_AVAILABLE = find_spec("h2") is not None
+
+# Most PMIDs ESearch returns in one reply
+MAX_PMIDS = 10000
+
+# On-disk cache of ESearch results, shared by all jobs; skipped if diskcache is not installed
+CACHE_DIR = os.getenv("PUBMED_CACHE_DIR", os.path.join("API_uploads", ".pubmed_cache"))
+CACHE_TTL = 7 * 24 * 60 * 60
+PUBMED_CACHE = diskcache.Cache(CACHE_DIR) if diskcache else None
+
+# PubMed search field for each author position
+AUTHOR_FIELDS = {None: "au", "first": "1au", "last": "lastau"}
+
+
+def author_term(author, role=None, last_n_years=None, keyword_string="", filter_label=None, language=None):
+    """
+    Build the PubMed query for an author's publications, optionally limited by
+    author position, a "last N years" window, a keyword string, a publication type and a language.
+    """
+    parts = [f'"{author.strip()}"[{AUTHOR_FIELDS[role]}]']
+    if last_n_years:
+        parts.append(f'"last {last_n_years} years"[dp]')
+    if keyword_string:
+        parts.append(f"({keyword_string})")
+    if filter_label:
+        parts.append(f'"{filter_label}"[pt]')
+    if language:
+        parts.append(f"{language}[la]")
+    return " AND ".join(parts)
+
+
+def esearch_params(term, **extra):
+    """
+    Query parameters for an ESearch call on PubMed.
+    """
+    params = {"db": "pubmed", "term": term, **extra}
+    if NCBI_API_KEY:
+        params["api_key"] = NCBI_API_KEY
+    return params
+
+
+def phrase_key(phrase):
+    """
+    A query phrase without quotes, case or extra whitespace, for comparing with ESearch's error echoes.
+    """
+    return " ".join(phrase.replace('"', "").lower().split())
+
+
+def author_not_found(root, term):
+    """
+    Check the <ErrorList> of an ESearch reply. ESearch drops a phrase it cannot find and still
+    answers for the rest of the query, so a reply that lost the author phrase (the first part of
+    an author_term) is reported as True: the author has no records. Any other reported error raises
+    ValueError, so the reply is treated as a failed query and never cached.
+    """
+    errors = root.find("ErrorList")
+    if errors is None or len(errors) == 0:
+        return False
+    not_found = {phrase_key(error.text or "") for error in errors.iterfind("PhraseNotFound")}
+    if phrase_key(term.split(" AND ", 1)[0]) in not_found:
+        return True
+    raise ValueError(f"ESearch reported errors: {ET.tostring(errors, encoding='unicode')}")
+
+
+def parse_count(xml_text, term):
+    """
+    Read <Count> from an ESearch XML reply; 0 when the author phrase was not found.
+    """
+    root = ET.fromstring(xml_text)
+    if author_not_found(root, term):
+        return 0
+    return int(root.findtext("Count"))
+
+
+def parse_ids(xml_text, term):
+    """
+    Read the PMIDs in <IdList> from an ESearch XML reply; empty when the author phrase was not found.
+    """
+    root = ET.fromstring(xml_text)
+    if author_not_found(root, term):
+        return frozenset()
+    return frozenset(int(pmid.text) for pmid in root.iterfind("IdList/Id"))
+
+
+class RateLimiter:
+    """
+    Spaces request starts so at most `rate` requests begin per second.
+    A caller about to send several requests reserves that many slots at once.
+    """
+    def __init__(self, rate):
+        self.interval = 1 / rate
+        self.next_start = 0.0
+        self.lock = asyncio.Lock()
+
+    async def wait(self, requests=1):
+        async with self.lock:
+            now = time.monotonic()
+            start = max(now, self.next_start)
+            self.next_start = start + self.interval * requests
+        await asyncio.sleep(start - now)
+
+
+# Shared by every request on the server's event loop, so connections stay warm
+# and the NCBI rate limit holds across concurrently validated jobs
+REQUESTS_PER_SECOND = MAX_REQUESTS_PER_SECOND if NCBI_API_KEY else MAX_REQUESTS_PER_SECOND_NO_KEY
+LIMITER = RateLimiter(REQUESTS_PER_SECOND)
+SEMAPHORE = asyncio.Semaphore(REQUESTS_PER_SECOND)
+HTTP_CLIENT = None
+
+# Statuses worth retrying, and the first retry delay in seconds (doubled on each attempt)
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+RETRY_BACKOFF = 0.5
+
+
+def get_client():
+    """
+    The shared AsyncClient, created on first use.
+    """
+    global HTTP_CLIENT
+    if HTTP_CLIENT is None or HTTP_CLIENT.is_closed:
+        limits = httpx.Limits(max_connections=REQUESTS_PER_SECOND, max_keepalive_connections=REQUESTS_PER_SECOND)
+        HTTP_CLIENT = httpx.AsyncClient(timeout=15, limits=limits, http2=HTTP2_AVAILABLE)
+    return HTTP_CLIENT
+
+
+async def close_client():
+    """
+    Close the shared AsyncClient; called on server shutdown.
+    """
+    if HTTP_CLIENT is not None:
+        await HTTP_CLIENT.aclose()
+
+
+async def fetch_esearch(term, retries=3, **extra):
+    """
+    Raw ESearch XML for term. Retries with exponential backoff when NCBI answers 429
+    (honouring Retry-After) or 5xx, or the connection fails; raises once retries run out.
+    """
+    for attempt in range(retries + 1):
+        delay = RETRY_BACKOFF * 2 ** attempt
+        await LIMITER.wait()
+        try:
+            # POST keeps long keyword-string queries out of the URL
+            response = await get_client().post(ESEARCH_URL, data=esearch_params(term, **extra))
+        except httpx.TransportError as e:
+            if attempt == retries:
+                raise
+            logger.warning("ESearch connection failed (%s), retrying '%s' in %ss", e, term, delay)
+            await asyncio.sleep(delay)
+            continue
+        if response.status_code not in RETRY_STATUSES or attempt == retries:
+            break
+        if response.status_code == 429:
+            try:
+                delay = float(response.headers.get("Retry-After", delay))
+            except ValueError:
+                pass
+        logger.warning("ESearch answered %s, retrying '%s' in %ss", response.status_code, term, delay)
+        await asyncio.sleep(delay)
+    response.raise_for_status()
+    return response.text
+
+
+def cache_get_many(keys):
+    """
+    Cached results for the given keys that are present in the disk cache.
+    """
+    if PUBMED_CACHE is None:
+        return {}
+    found = {}
+    for key in keys:
+        value = PUBMED_CACHE.get(key)
+        if value is not None:
+            found[key] = value
+    return found
+
+
+def cache_set_many(items):
+    """
+    Store results in the disk cache in a single transaction.
+    """
+    if PUBMED_CACHE is None or not items:
+        return
+    with PUBMED_CACHE.transact():
+        for key, value in items.items():
+            PUBMED_CACHE.set(key, value, expire=CACHE_TTL)
+
+
+async def esearch_all(terms, parse, **extra):
+    """
+    Run one ESearch per distinct term concurrently within the NCBI rate limit and
+    return {term: parse(xml, term)}. Terms whose query fails are left out, so callers can retry them.
+    Successful results are kept in the disk cache, when available, for CACHE_TTL seconds.
+    """
+    cache_kind = tuple(sorted(extra.items()))
+    keys = {term: (term, cache_kind) for term in terms}
+
+    # The disk cache is SQLite, so it is read and written in worker threads, one batch each way
+    cached = await asyncio.to_thread(cache_get_many, keys.values())
+    found = {term: cached[key] for term, key in keys.items() if key in cached}
+    missing = [term for term in keys if term not in found]
+
+    async def search(term):
+        async with SEMAPHORE:
+            try:
+                return parse(await fetch_esearch(term, **extra), term)
+            except (httpx.HTTPError, ET.ParseError, TypeError, ValueError) as e:
+                logger.error("ESearch failed for '%s': %s", term, e)
+                return None
+
+    results = await asyncio.gather(*(search(term) for term in missing))
+    fetched = {term: result for term, result in zip(missing, results) if result is not None}
+    await asyncio.to_thread(cache_set_many, {keys[term]: result for term, result in fetched.items()})
+    return {**found, **fetched}
+
+
+async def esearch_counts(terms):
+    """
+    Number of PubMed records for each distinct term. Terms whose query fails are left out.
+    """
+    return await esearch_all(terms, parse_count, rettype="count")
+
+
+async def esearch_pmids(terms):
+    """
+    Set of PubMed IDs for each distinct term. Terms whose query fails are left out.
+    """
+    return await esearch_all(terms, parse_ids, retmax=MAX_PMIDS)
@@ -1,33 +1,46 @@
 from fastapi import File, UploadFile
-from fastapi.responses import JSONResponse
+import asyncio
+from ast import literal_eval
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from functools import lru_cache
+from collections import namedtuple, OrderedDict
+import aiofiles
+from anyio import from_thread
+import orjson
+from fastapi.responses import ORJSONResponse, FileResponse
+from starlette.formparsers import MultiPartParser
 import os
+import csv
+import pickle
+import re
+from pathlib import Path
+import numpy as np
+import pandas as pd
 from fastapi import FastAPI, Form
 import uuid
-from fastapi import Query
-from pubmed_article_type import pubmed_filtered_count
+from fastapi import Depends, Query
 from mesh_terms import get_mesh_terms
 from refined_prompt_focus import *
-from pubmed_extraction_new import *
-from science_direct_new import *
-from tandfonline_new import *
-from wiley_online_library_new import *
 from doc_to_docx import *
 from prompt_additional_keywords import *
-from itertools import zip_longest
 from pubmed_author_search import *
-import datetime
-from pubmed_coauthour import *
 from author_aff_prompt import *
 from pubmed_author_email_aff import *
 from aff_country_extraction import *
 from same_country import *
-from pubmed_clinical_trail import *
 from city_extract import *
 from country_extract import *
-from tandfonline_author_pub_last_year import *
-from pubmed_no_english_pub import *
+# After the helper wildcards, so none of them can rebind these names
+from itertools import zip_longest, chain
+from datetime import datetime
+from pubmed_eutils import LIMITER, author_term, esearch_counts, esearch_pmids, close_client
+from tandfonline_search import tf_publication_counts, close_tf_client
 import logging
-from logging.handlers import RotatingFileHandler
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+import queue
+import threading
+import atexit
 
 # Create logs directory
 LOG_DIR = "logs"
@@ -35,25 +48,348 @@ os.makedirs(LOG_DIR, exist_ok=True)
 
 # Configure logger
 logger = logging.getLogger("scholarfinder_logger")
-logger.setLevel(logging.DEBUG)  # Log everything >= DEBUG
+# INFO by default so the debug dumps of metadata and author maps are skipped before any formatting;
+# set LOG_LEVEL=DEBUG to include them
+logger.setLevel(os.getenv("LOG_LEVEL", "INFO").upper())
 
 # Log to a rotating file (max 5MB per file, keep 5 backups)
 file_handler = RotatingFileHandler(LOG_DIR + "/scholarfinder.log", maxBytes=5*1024*1024, backupCount=5)
 formatter = logging.Formatter("%(asctime)s | %(levelname)s | %(name)s | %(message)s")
 file_handler.setFormatter(formatter)
-logger.addHandler(file_handler)
 
 # Optional: also log to console
 console_handler = logging.StreamHandler()
 console_handler.setFormatter(formatter)
-logger.addHandler(console_handler)
+
+
+
+class DeferredQueueHandler(QueueHandler):
+    """
+    Enqueue records as they are; the listener thread formats them when writing.
+    (QueueHandler.prepare would format the message on the logging thread.)
+    """
+    def prepare(self, record):
+        return record
+
+
+# Requests only enqueue records; a background thread formats and writes them to the file and console
+log_queue = queue.Queue(-1)
+logger.addHandler(DeferredQueueHandler(log_queue))
+log_listener = QueueListener(log_queue, file_handler, console_handler, respect_handler_level=True)
+log_listener.start()
+atexit.register(log_listener.stop)
 
 # Directories
 UPLOAD_DIR = "API_uploads"
 os.makedirs(UPLOAD_DIR, exist_ok=True)
 BASE_DIR = Path("API_uploads")
 
-app = FastAPI(title="ScholarFinder APIs")
+# Uploads are streamed to disk in 1 MB chunks; files up to 8 MB stay in memory
+# while the request is parsed instead of rolling over to a temporary file.
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+UPLOAD_SPOOL_SIZE = 8 * 1024 * 1024
+
+# Starlette renamed the spool threshold from max_file_size to spool_max_size
+for spool_attr in ("spool_max_size", "max_file_size"):
+    if hasattr(MultiPartParser, spool_attr):
+        setattr(MultiPartParser, spool_attr, UPLOAD_SPOOL_SIZE)
+        logger.info("Upload spool threshold set via MultiPartParser.%s", spool_attr)
+        break
+else:
+    logger.warning("MultiPartParser has no spool threshold attribute; using Starlette's default")
+
+# Well-known files of a job folder, resolved by job_paths()
+JobPaths = namedtuple("JobPaths", ["job_id", "dir", "metadata", "keywords", "keyword_string"])
+# Least recently used jobs are evicted once JOB_PATHS_CACHE_SIZE jobs are cached
+# Sync endpoints share it from FastAPI's thread pool, so every access holds JOB_PATHS_LOCK
+JOB_PATHS_CACHE = OrderedDict()
+JOB_PATHS_CACHE_SIZE = 1024
+JOB_PATHS_LOCK = threading.Lock()
+
+# Columns of the combined article table built by /database_search
+ARTICLE_COLUMNS = ["Title", "Authors(potential reviewers)", "Emails",
+                   "Author_Email_Map", "Author_with_Affiliation", "Website"]
+
+# Columns of Final_authors_display.csv and the /validate_authors preview
+REVIEWER_DISPLAY_COLUMNS = [
+    'reviewer', 'email', 'aff', 'country', 'Total_Publications', 'English_Pubs',
+    'Publications_10_years', 'Relevant_Publications_5_years',
+    'Publications_2_years)', 'Publications_last_year)', 'Clinical_Trials_no', 'Clinical_study_no',
+    'Case_reports_no', 'Retracted_Pubs_no', 'TF_Publications_last_year', 'coauthor',
+    'country_match', 'aff_match', 'no_of_pub_condition_10_years', 'no_of_pub_condition_5_years',
+    'no_of_pub_condition_2_years', 'english_condition', 'coauthor_condition', 'aff_condition',
+    'country_match_condition', 'retracted_condition', 'conditions_met', 'conditions_satisfied'
+]
+
+# Folder inside each job for intermediate /validate_authors results
+JOB_CACHE_DIR = ".cache"
+
+# Rows per block when writing the validated author CSVs
+CSV_CHUNK_SIZE = 10_000
+
+# Academic degrees stripped from scraped author names
+DEGREE_WORDS = {
+    "MD", "PhD", "BD", "MS", "MSc", "BSc", "DDS", "DO", "DVM", "DrPH",
+    "MPH", "MBA", "EdD", "DPhil", "ScD", "DSc", "FRCP", "FRCS", "DPM"
+}
+DEGREE_PATTERN = re.compile(r"\b(" + "|".join(map(re.escape, DEGREE_WORDS)) + r")\b")
+WHITESPACE_PATTERN = re.compile(r"\s+")
+
+# First JSON object in a Claude reply, and the top-level OR/AND separators of a focus string
+JSON_OBJECT_PATTERN = re.compile(r'\{.*?\}', re.DOTALL)
+FOCUS_SPLIT_PATTERN = re.compile(r'\s+(?=OR|AND)(?![^()]*\))\s+')
+
+
+def clean_author_name(name):
+    """
+    Remove degrees and commas from an author name and collapse whitespace, in a single pass.
+    """
+    name = DEGREE_PATTERN.sub("", name).replace(",", "")
+    return WHITESPACE_PATTERN.sub(" ", name).strip()
+
+
+class JobNotFoundError(Exception):
+    """
+    Raised by require_job when the requested job folder does not exist.
+    """
+    def __init__(self, job_id):
+        super().__init__(job_id)
+        self.job_id = job_id
+
+
+class AuthorLookupError(Exception):
+    """
+    Raised by lookup_manual_author when the PubMed search itself failed,
+    as opposed to finding no matching author.
+    """
+
+
+def job_paths(job_id):
+    """
+    Resolve a job's folder and its metadata, keywords and keyword string files with a single directory scan.
+    Returns None if the job folder does not exist. Fully resolved jobs are cached, since those
+    file names never change; partial ones are rescanned as later steps add the missing files.
+    A cached job whose folder has since been deleted is dropped and reported as missing.
+    """
+    with JOB_PATHS_LOCK:
+        paths = JOB_PATHS_CACHE.get(job_id)
+    if paths is not None:
+        job_exists = paths.dir.is_dir()
+        with JOB_PATHS_LOCK:
+            if job_exists and job_id in JOB_PATHS_CACHE:
+                JOB_PATHS_CACHE.move_to_end(job_id)
+            elif not job_exists:
+                JOB_PATHS_CACHE.pop(job_id, None)
+        if job_exists:
+            return paths
+
+    job_dir = BASE_DIR / job_id
+    metadata = keywords = keyword_string = None
+    try:
+        with os.scandir(job_dir) as entries:
+            for entry in entries:
+                if metadata is None and entry.name.endswith("_metadata.json"):
+                    metadata = Path(entry.path)
+                elif keywords is None and entry.name.endswith("_keywords.json"):
+                    keywords = Path(entry.path)
+                elif keyword_string is None and entry.name.endswith("_keywordstring.json"):
+                    keyword_string = Path(entry.path)
+    except FileNotFoundError:
+        return None
+
+    paths = JobPaths(job_id, job_dir, metadata, keywords, keyword_string)
+    if None not in paths:
+        with JOB_PATHS_LOCK:
+            JOB_PATHS_CACHE[job_id] = paths
+            if len(JOB_PATHS_CACHE) > JOB_PATHS_CACHE_SIZE:
+                JOB_PATHS_CACHE.popitem(last=False)
+    return paths
+
+
+def require_job(job_id: str = Query(..., description="Unique job ID from upload_extract_metadata")):
+    """
+    FastAPI dependency resolving the job folder and its files; unknown jobs get a 404.
+    """
+    paths = job_paths(job_id)
+    if paths is None:
+        logger.error("Invalid job_id '%s'. Job folder does not exist.", job_id)
+        raise JobNotFoundError(job_id)
+    return paths
+
+
+def read_json(path):
+    """
+    Load a JSON file from a job folder.
+    If the file has been removed, the job's cached paths are stale: they are dropped and the job is reported missing.
+    """
+    path = Path(path)
+    try:
+        return orjson.loads(path.read_bytes())
+    except FileNotFoundError:
+        job_id = path.parent.name
+        with JOB_PATHS_LOCK:
+            JOB_PATHS_CACHE.pop(job_id, None)
+        logger.error("Job file %s no longer exists", path)
+        raise JobNotFoundError(job_id)
+
+
+def write_json(path, data):
+    """
+    Save data to a job folder as indented UTF-8 JSON.
+    """
+    Path(path).write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+
+
+def reviewer_records(reviewers_df):
+    """
+    Rows of reviewers_df as JSON-ready dicts; metrics whose lookup failed (<NA>) become null.
+    """
+    return reviewers_df.astype(object).where(reviewers_df.notna(), None).to_dict(orient="records")
+
+
+def write_reviewers_json(path, job_id, reviewers_df):
+    """
+    Save the /recommended_reviewers response body for a validated job, so it can be served as a file.
+    """
+    payload = {
+        "job_id": job_id,
+        "reviewer_count": len(reviewers_df),
+        "reviewers": reviewer_records(reviewers_df)
+    }
+    Path(path).write_bytes(orjson.dumps(payload, option=orjson.OPT_SERIALIZE_NUMPY))
+
+
+def load_job_cache(job_dir, name):
+    """
+    Intermediate result saved by an earlier /validate_authors run of this job, or {} if there is none.
+    """
+    cache_path = job_dir / JOB_CACHE_DIR / f"{name}.pkl"
+    if not cache_path.exists():
+        return {}
+    try:
+        return pickle.loads(cache_path.read_bytes())
+    except Exception as e:
+        logger.warning("Ignoring unreadable cache %s: %s", cache_path, e)
+        return {}
+
+
+def save_job_cache(job_dir, name, data):
+    """
+    Save an intermediate /validate_authors result so a re-run of the job can reuse it.
+    """
+    cache_dir = job_dir / JOB_CACHE_DIR
+    cache_dir.mkdir(exist_ok=True)
+    # Written to a temporary file and swapped in, so a crash never leaves a truncated cache
+    cache_path = cache_dir / f"{name}.pkl"
+    tmp_path = cache_path.with_suffix(".pkl.tmp")
+    tmp_path.write_bytes(pickle.dumps(data))
+    os.replace(tmp_path, cache_path)
+
+
+def to_article_rows(data, columns=None):
+    """
+    Normalize a scraper result (DataFrame, list of records or None) to a list of row dicts.
+    """
+    if data is None:
+        return []
+    if isinstance(data, pd.DataFrame):
+        return data.to_dict(orient="records")
+    if columns is None and isinstance(data, list) and all(isinstance(row, dict) for row in data):
+        return data
+    return pd.DataFrame(data, columns=columns).to_dict(orient="records")
+
+
+def parse_author_map(value):
+    """
+    Return a scraped author map as a dict; some scrapers store it as its repr string.
+    """
+    return literal_eval(value) if isinstance(value, str) else value
+
+
+@lru_cache(maxsize=4096)
+def extract_city_country(aff):
+    """
+    Return the (city, country) pair for a single affiliation string.
+    Cached for the life of the worker, so institutions seen in earlier jobs are not re-parsed.
+    """
+    return extract_city(aff), extract_country(aff)
+
+
+def location_text(value):
+    """
+    Render an extracted city/country (a string, a set of candidates or None) as plain text.
+    """
+    if isinstance(value, set):
+        return ', '.join(value)
+    return str(value) if value else ""
+
+
+def locate_affiliations(affiliations):
+    """
+    Extract city and country once per distinct affiliation, as plain text.
+    Returns two dicts: affiliation -> city and affiliation -> country.
+    """
+    unique_affs = list(dict.fromkeys(affiliations))
+    located = [extract_city_country(aff) for aff in unique_affs]
+    city_map = {aff: location_text(city) for aff, (city, _) in zip(unique_affs, located)}
+    country_map = {aff: location_text(country) for aff, (_, country) in zip(unique_affs, located)}
+    return city_map, country_map
+
+
+async def fetch_validation_data(count_terms, pmid_terms, tf_authors):
+    """
+    PubMed counts, PMID sets and T&F counts for /validate_authors, looked up concurrently.
+    Runs on the server's event loop, which owns the shared HTTP clients. A lookup that fails
+    as a whole is logged and returns nothing, so the results of the others are still kept.
+    """
+    results = await asyncio.gather(
+        esearch_counts(count_terms),
+        esearch_pmids(pmid_terms),
+        tf_publication_counts(tf_authors, year_from="2024", year_to="2025"),
+        return_exceptions=True
+    )
+    names = ("PubMed count", "PubMed PMID", "T&F count")
+    fallbacks = ({}, {}, [None] * len(tf_authors))
+    checked = []
+    for name, result, fallback in zip(names, results, fallbacks):
+        if isinstance(result, Exception):
+            logger.error("%s lookups failed: %s", name, result)
+            result = fallback
+        checked.append(result)
+    return checked
+
+
+def shares_pmids(pmid_sets):
+    """
+    For each PMID set, whether it has a PMID in common with any other set.
+    Each set's PMIDs are unique, so a PMID seen more than once overall belongs to at least two sets.
+    """
+    sizes = np.array([len(pmids) for pmids in pmid_sets], dtype=np.int64)
+    owners = np.repeat(np.arange(len(pmid_sets)), sizes)
+    # PMIDs fit in 32 bits, which halves the memory the sort has to move
+    all_pmids = np.fromiter(chain.from_iterable(pmid_sets), dtype=np.uint32, count=len(owners))
+    # After one sort, equal PMIDs are adjacent; both ends of every equal pair are shared
+    order = np.argsort(all_pmids, kind="stable")
+    sorted_pmids = all_pmids[order]
+    repeats = sorted_pmids[1:] == sorted_pmids[:-1]
+    shared = np.zeros(len(sorted_pmids), dtype=bool)
+    shared[1:] |= repeats
+    shared[:-1] |= repeats
+    flags = np.zeros(len(pmid_sets), dtype=bool)
+    flags[owners[order[shared]]] = True
+    return flags
+
+
+@asynccontextmanager
+async def lifespan(app):
+    """
+    Close the shared PubMed and T&F HTTP clients on server shutdown.
+    """
+    yield
+    await asyncio.gather(close_client(), close_tf_client())
+
+
+app = FastAPI(title="ScholarFinder APIs", default_response_class=ORJSONResponse, lifespan=lifespan)
 
 # Add CORS middleware to allow frontend requests
 from fastapi.middleware.cors import CORSMiddleware
@@ -71,6 +407,15 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+
+@app.exception_handler(JobNotFoundError)
+async def job_not_found_handler(request, exc):
+    return ORJSONResponse(
+        content={"error": f"Invalid job_id '{exc.job_id}'. Please upload and extract metadata first."},
+        status_code=404
+    )
+
+
 # Add OPTIONS handler for preflight requests
 @app.options("/{full_path:path}")
 async def options_handler(full_path: str):
@@ -93,54 +438,57 @@ async def upload_extract_metadata(file: UploadFile = File(...)):
     # print("\nupload_extract_metadata started...")
     # print(f"Job ID : {job_id}")
     logger.info("\n--------------------------------------------------------------------------------")
-    logger.info(f"\nJob ID: {job_id}")
+    logger.info("\nJob ID: %s", job_id)
     logger.info("upload_extract_metadata started")
 
     # Save uploaded file
     save_path = job_dir / file.filename
-    with open(save_path, "wb") as f:
-        shutil.copyfileobj(file.file, f)
+    async with aiofiles.open(save_path, "wb") as f:
+        while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+            await f.write(chunk)
     # print(f"Uploaded file saved at: {save_path}")
-    logger.info(f"Uploaded file saved at: {save_path}")
+    logger.info("Uploaded file saved at: %s", save_path)
 
     full_file_path = os.path.abspath(save_path)
 
     # Convert .doc → .docx if needed
     if save_path.suffix.lower() == ".doc":
-        output_path = convert_doc_to_docx(full_file_path)
+        output_path = await asyncio.to_thread(convert_doc_to_docx, full_file_path)
         # print(f"Converted .doc to .docx at: {output_path}")
-        logger.info(f"Converted .doc to .docx at: {output_path}")
+        logger.info("Converted .doc to .docx at: %s", output_path)
     else:
         output_path = save_path
         # print(f"No conversion needed, using file: {output_path}")
-        logger.info(f"No conversion needed, using file: {output_path}")
+        logger.info("No conversion needed, using file: %s", output_path)
 
-    trim_path, marker_found = trim_docx_copy(output_path)
-    logger.info(f"Marker: {marker_found}")
-    logger.info(f"Trimmed docx at: {trim_path}")
+    trim_path, marker_found = await asyncio.to_thread(trim_docx_copy, output_path)
+    logger.info("Marker: %s", marker_found)
+    logger.info("Trimmed docx at: %s", trim_path)
 
-    txt_file, manuscript_text = docx_to_text(trim_path)
-    logger.info(f"Converted DOCX to TXT: {txt_file}")
+    txt_file, manuscript_text = await asyncio.to_thread(docx_to_text, trim_path)
+    logger.info("Converted DOCX to TXT: %s", txt_file)
 
     # metadata = claude_extract_manuscript_metadata(manuscript_text)
-    metadata, heading, authors, affiliations, keywords, abstract, author_aff_map = claude_extract_manuscript_metadata(manuscript_text)
+    metadata, heading, authors, affiliations, keywords, abstract, author_aff_map = await asyncio.to_thread(
+        claude_extract_manuscript_metadata, manuscript_text
+    )
 
     # print("\n--- Extracted Metadata ---")
     # print(json.dumps(metadata, indent=4))
-    logger.info(f"Manuscript metadata: {metadata}")
+    logger.debug("Manuscript metadata: %s", metadata)
     # print("\nTitle:", heading)
-    logger.info(f"Heading: {heading}")
+    logger.info("Heading: %s", heading)
     # print("Authors:", authors)
-    logger.info(f"Authors: {authors}")
+    logger.info("Authors: %s", authors)
     # print("Affiliations:", affiliations)
-    logger.info(f"Affiliations: {affiliations}")
+    logger.info("Affiliations: %s", affiliations)
     # print("Keywords:", keywords)
-    logger.info(f"Keywords: {keywords}")
+    logger.info("Keywords: %s", keywords)
     # print("Abstract:", abstract)
-    logger.info(f"Abstract: {abstract}")
-    logger.info(f"Abstract length: {len(abstract)} characters")
+    logger.debug("Abstract: %s", abstract)
+    logger.info("Abstract length: %s characters", len(abstract))
     # print("Author-Affiliation Map:", json.dumps(author_aff_map, indent=4))
-    logger.info(f"Author-Affiliation Map: {author_aff_map}")
+    logger.debug("Author-Affiliation Map: %s", author_aff_map)
 
     result = {
         "job_id": job_id,
@@ -156,12 +504,11 @@ async def upload_extract_metadata(file: UploadFile = File(...)):
     metadata_filename = f"{Path(file.filename).stem}_metadata.json"
     metadata_path = job_dir / metadata_filename
 
-    with open(metadata_path, "w", encoding="utf-8") as f:
-        json.dump(result, f, indent=2, ensure_ascii=False)
+    write_json(metadata_path, result)
     # print(f"Metadata saved at: {metadata_path}")
-    logger.info(f"Metadata saved at: {metadata_path}\n")
+    logger.info("Metadata saved at: %s\n", metadata_path)
 
-    return JSONResponse(content={
+    return ORJSONResponse(content={
         "message": "Metadata extracted successfully.",
         "data": result
     })
@@ -171,45 +518,36 @@ async def upload_extract_metadata(file: UploadFile = File(...)):
 # 2️⃣ VIEW CURRENT METADATA
 # -----------------------------------------------------------
 @app.get("/metadata_extraction")
-def metadata_extraction(job_id: str = Query(..., description="Unique job ID from upload_extract_metadata")):
+def metadata_extraction(job: JobPaths = Depends(require_job)):
     """
     Display the extracted metadata for a given job_id.
     """
 
-    job_dir = BASE_DIR / job_id
-    if not job_dir.exists():
-        # print(f"Invalid job_id '{job_id}'. Job folder does not exist.")
-        logger.error(f"Invalid job_id '{job_id}'. Job folder does not exist.")
-        return JSONResponse(
-            content={"error": f"Invalid job_id '{job_id}'. Please check or re-upload your file."},
-            status_code=404
-        )
+    job_id, job_dir = job.job_id, job.dir
 
     # print(f"\nFetching metadata for job_id: {job_id}")
     logger.info("Metadata extraction")
-    logger.info(f"Fetching metadata for job_id: {job_id}")
+    logger.info("Fetching metadata for job_id: %s", job_id)
 
     # Prefer *_keywords.json if available, otherwise *_metadata.json
-    metadata_files = list(job_dir.glob("*_keywords.json")) or list(job_dir.glob("*_metadata.json"))
-    if not metadata_files:
+    metadata_path = job.keywords or job.metadata
+    if not metadata_path:
         # print(f"No metadata found for job_id '{job_id}'.")
-        logger.warning(f"No metadata found for job_id '{job_id}'.")
-        return JSONResponse(
+        logger.warning("No metadata found for job_id '%s'.", job_id)
+        return ORJSONResponse(
             content={"error": f"No metadata found for job_id '{job_id}'."},
             status_code=404
         )
 
-    metadata_path = metadata_files[0]
     # print(f"Metadata file found: {metadata_path.name}")
-    logger.info(f"Metadata file found: {metadata_path.name}")
+    logger.info("Metadata file found: %s", metadata_path.name)
 
-    with open(metadata_path, "r", encoding="utf-8") as f:
-        metadata_result = json.load(f)
+    metadata_result = read_json(metadata_path)
 
     # print(f"Metadata loaded successfully for job_id: {job_id}")
-    logger.info(f"Metadata loaded successfully for job_id: {job_id}\n")
+    logger.info("Metadata loaded successfully for job_id: %s\n", job_id)
 
-    return JSONResponse(content={
+    return ORJSONResponse(content={
         "job_id": job_id,
         "file_name": metadata_path.name,
         "data": metadata_result
@@ -220,39 +558,29 @@ def metadata_extraction(job_id: str = Query(..., description="Unique job ID from
 # 3️⃣ EXTEND METADATA — MeSH, Focus, Keywords
 # -----------------------------------------------------------
 @app.post("/keyword_enhancement")
-def keyword_enhancement(job_id: str = Query(..., description="Unique job ID from upload_extract_metadata")):
-    job_dir = BASE_DIR / job_id
-    if not job_dir.exists():
-        # print(f"Invalid job_id '{job_id}'. Job folder does not exist.")
-        logger.error(f"Invalid job_id '{job_id}'. Job folder does not exist.")
-        return JSONResponse(
-            content={"error": f"Invalid job_id '{job_id}'. Please upload and extract metadata first."},
-            status_code=404
-        )
+def keyword_enhancement(job: JobPaths = Depends(require_job)):
+    job_id, job_dir = job.job_id, job.dir
 
     # 🔍 Find any *_metadata.json file
-    metadata_files = list(job_dir.glob("*_metadata.json"))
-    if not metadata_files:
+    metadata_path = job.metadata
+    if not metadata_path:
         # print(f"No base metadata found for job_id '{job_id}'.")
-        logger.warning(f"No base metadata found for job_id '{job_id}'.")
-        return JSONResponse(
+        logger.warning("No base metadata found for job_id '%s'.", job_id)
+        return ORJSONResponse(
             content={"error": "No base metadata found in folder. Please run /upload_extract_metadata first."},
             status_code=404
         )
 
-    # Pick the first metadata file
-    metadata_path = metadata_files[0]
     base_name = metadata_path.stem.replace("_metadata", "")
     focus_path = job_dir / f"{base_name}_focus_keywords.json"
 
     # print("\nkeyword_enhancement started...")
-    logger.info(f"keyword_enhancement started for job_id: {job_id}")
+    logger.info("keyword_enhancement started for job_id: %s", job_id)
 
     # Load metadata
-    with open(metadata_path, "r", encoding="utf-8") as f:
-        input_data = json.load(f)
+    input_data = read_json(metadata_path)
     # print(f"Loaded metadata file: {metadata_path.name}")
-    logger.info(f"Loaded metadata file: {metadata_path.name}")
+    logger.info("Loaded metadata file: %s", metadata_path.name)
 
     extracted_heading = input_data.get("heading", "")
     extracted_abstract = input_data.get("abstract", "")
@@ -262,17 +590,17 @@ def keyword_enhancement(job_id: str = Query(..., description="Unique job ID from
     mesh_terms, broader_terms = get_mesh_terms(extracted_heading)
     # print("\nMesh terms:\n ", mesh_terms)
     # print("\nBroader terms:\n ", broader_terms)
-    logger.info(f"Mesh terms: {mesh_terms}, Broader terms: {broader_terms}")
+    logger.info("Mesh terms: %s, Broader terms: %s", mesh_terms, broader_terms)
 
     # Step 2: Get primary/secondary focus from Claude
     primary_secondary = primary_sec(extracted_heading, extracted_abstract, extracted_keywords, mesh_terms)
     # print("\nPrimary and secondary focus from claude:\n", primary_secondary)
     logger.info("Primary and secondary focus received from Claude")
 
-    json_match = re.search(r'\{.*?\}', primary_secondary, re.DOTALL)
+    json_match = JSON_OBJECT_PATTERN.search(primary_secondary)
     if json_match:
         json_text = json_match.group()
-        data = json.loads(json_text)
+        data = orjson.loads(json_text)
         logger.info("Successfully parsed JSON from Claude output")
     else:
         logger.error("JSON object not found in Claude output")
@@ -283,33 +611,34 @@ def keyword_enhancement(job_id: str = Query(..., description="Unique job ID from
         focus_str = focus_str.strip()
         if focus_str.startswith("(") and focus_str.endswith(")"):
             focus_str = focus_str[1:-1].strip()
-        pattern = r'\s+(?=OR|AND)(?![^()]*\))\s+'
-        return [x.strip() for x in re.split(pattern, focus_str)]
+        return [x.strip() for x in FOCUS_SPLIT_PATTERN.split(focus_str)]
 
     primary_focus = smart_split(data["primary focus"])
     secondary_focus = smart_split(data["secondary focus"])
     # print("\nPrimary focus: \n", primary_focus)
     # print('\nSecondary focus: \n', secondary_focus)
-    logger.info(f"Primary focus: {primary_focus}, Secondary focus: {secondary_focus}")
+    logger.info("Primary focus: %s, Secondary focus: %s", primary_focus, secondary_focus)
 
-    primary_focus_string = primary_focus[0].replace(" OR ", ", ")
-    secondary_focus_string = secondary_focus[0].replace(" OR ", ", ")
+    primary_focus_terms = [kw.strip() for kw in primary_focus[0].split(" OR ")]
+    secondary_focus_terms = [kw.strip() for kw in secondary_focus[0].split(" OR ")]
+    primary_focus_string = ", ".join(primary_focus_terms)
+    secondary_focus_string = ", ".join(secondary_focus_terms)
     # print("\nPrimary focus string: \n", primary_focus_string)
     # print('\nSecondary focus string: \n', secondary_focus_string)
-    logger.info(f"Primary string: {primary_focus_string} and secondary focus string: {secondary_focus_string}")
+    logger.info("Primary string: %s and secondary focus string: %s", primary_focus_string, secondary_focus_string)
 
     add_keywords_output = additional_keywords(
         extracted_heading, extracted_abstract, extracted_keywords,
         mesh_terms, primary_focus_string, secondary_focus_string
     )
     # print("\nAdditional keywords output: \n", add_keywords_output)
-    logger.info(f"Additional keywords: {add_keywords_output}")
+    logger.debug("Additional keywords: %s", add_keywords_output)
 
     # Parse additional keywords JSON
-    json_match = re.search(r'\{.*?\}', add_keywords_output, re.DOTALL)
+    json_match = JSON_OBJECT_PATTERN.search(add_keywords_output)
     if json_match:
         json_text = json_match.group()
-        data = json.loads(json_text)
+        data = orjson.loads(json_text)
         logger.info("Parsed additional keywords JSON successfully")
     else:
         logger.error("JSON object not found in additional keywords output")
@@ -325,69 +654,53 @@ def keyword_enhancement(job_id: str = Query(..., description="Unique job ID from
 
     # print("\nAdditional primary keywords: \n", additional_primary_keywords)
     # print("\nAdditional secondary keywords: \n", additional_secondary_keywords)
-    logger.info(f"Additional primary keywords: {additional_primary_keywords}")
-    logger.info(f"Additional secondary keywords: {additional_secondary_keywords}")
-
-    additional_primary_keywords_string = ", ".join(additional_primary_keywords)
-    additional_secondary_keywords_string = ", ".join(additional_secondary_keywords)
-
-    # print("\nAdditional primary keywords string:\n", additional_primary_keywords_string)
-    # print("\nAdditional secondary keywords string:\n", additional_secondary_keywords_string)
-    logger.info(f"Additional primary keywords string: {additional_primary_keywords_string}")
-    logger.info(f"Additional secondary keywords string: {additional_secondary_keywords_string}")
-
-    all_primary_focus_string = primary_focus_string + ", " + additional_primary_keywords_string
-    all_secondary_focus_string = secondary_focus_string + ", " + additional_secondary_keywords_string
-    # print("\nAll primary focus keywords:\n", all_primary_focus_string)
-    logger.info(f"All primary focus keywords: {all_primary_focus_string}")
-    # print("\nAll secondary focus keywords:\n", all_secondary_focus_string)
-    logger.info(f"All secondary focus keywords: {all_secondary_focus_string}")
-
-    all_primary_focus_list = [s.strip() for s in all_primary_focus_string.split(",")]
-    all_secondary_focus_list = [s.strip() for s in all_secondary_focus_string.split(",")]
+    logger.info("Additional primary keywords: %s", additional_primary_keywords)
+    logger.info("Additional secondary keywords: %s", additional_secondary_keywords)
+
+    additional_primary_terms = [kw.strip() for kw in additional_primary_keywords]
+    additional_secondary_terms = [kw.strip() for kw in additional_secondary_keywords]
+    all_primary_focus_list = [kw for kw in primary_focus_terms + additional_primary_terms if kw]
+    all_secondary_focus_list = [kw for kw in secondary_focus_terms + additional_secondary_terms if kw]
     # print("\nAll primary focus keywords list:\n", all_primary_focus_list)
-    logger.info(f"All primary focus keywords list: {all_primary_focus_list}")
-    logger.info(f"All secondary focus keywords list:\n", all_secondary_focus_list)
+    logger.info("All primary focus keywords list: %s", all_primary_focus_list)
+    logger.info("All secondary focus keywords list: %s", all_secondary_focus_list)
     # print("\nAll secondary focus keywords list:\n", all_secondary_focus_list)
 
-    all_data = list(zip_longest(all_primary_focus_list, all_secondary_focus_list))
-    all_df = pd.DataFrame(all_data, columns=['Primary keywords', 'Secondary keywords']).fillna("")
-    all_df.to_csv(job_dir / "keywords.csv", index=False)
+    with open(job_dir / "keywords.csv", "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f, lineterminator="\n")
+        writer.writerow(['Primary keywords', 'Secondary keywords'])
+        writer.writerows(zip_longest(all_primary_focus_list, all_secondary_focus_list, fillvalue=""))
     logger.info("Saved keywords.csv")
-    extended_json = input_data.copy()
-    extended_json.update({
+    focus_keywords = {
         "mesh_terms": mesh_terms,
         "broader_terms": broader_terms,
         "primary_focus": primary_focus,
         "secondary_focus": secondary_focus,
         "additional_primary_keywords": additional_primary_keywords,
-        "additional_secondary_keywords": additional_secondary_keywords,
+        "additional_secondary_keywords": additional_secondary_keywords
+    }
+    extended_json = {
+        **input_data,
+        **focus_keywords,
         "all_primary_focus_list": all_primary_focus_list,
         "all_secondary_focus_list": all_secondary_focus_list
-    })
+    }
 
     # Save metadata and focus files
-    with open(metadata_path, "w", encoding="utf-8") as f:
-        json.dump(extended_json, f, indent=2, ensure_ascii=False)
-    logger.info(f"Metadata saved: {metadata_path.name}")
+    write_json(metadata_path, extended_json)
+    logger.info("Metadata saved: %s", metadata_path.name)
 
     focus_json = {
         "job_id": job_id,
         "file_name": focus_path.name,
         "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-        "mesh_terms": mesh_terms,
-        "broader_terms": broader_terms,
-        "primary_focus": primary_focus,
-        "secondary_focus": secondary_focus,
-        "additional_primary_keywords": additional_primary_keywords,
-        "additional_secondary_keywords": additional_secondary_keywords
+        **focus_keywords
     }
 
-    with open(focus_path, "w", encoding="utf-8") as f:
-        json.dump(focus_json, f, indent=2, ensure_ascii=False)
-    logger.info(f"Focus keywords saved: {focus_path.name}\n")
+    write_json(focus_path, focus_json)
+    logger.info("Focus keywords saved: %s\n", focus_path.name)
 
-    return JSONResponse(content={
+    return ORJSONResponse(content={
         "message": f"Keyword enhancement completed successfully for {base_name}.",
         "job_id": job_id,
         "metadata_file": metadata_path.name,
@@ -401,7 +714,7 @@ def keyword_enhancement(job_id: str = Query(..., description="Unique job ID from
 # -----------------------------------------------------------
 @app.post("/keyword_string_generator")
 def keyword_string_generator(
-        job_id: str = Query(..., description="Unique job ID folder name created during upload_extract_metadata"),
+        job: JobPaths = Depends(require_job),
         primary_keywords_input: str = Form(...),
         secondary_keywords_input: str = Form(...)
 ):
@@ -411,43 +724,34 @@ def keyword_string_generator(
     Works within the job directory using job_id.
     """
 
-    job_dir = BASE_DIR / job_id
-    if not job_dir.exists():
-        # print(f"Invalid job_id '{job_id}'. Job folder does not exist.")
-        logger.error(f"Invalid job_id '{job_id}'. Job folder does not exist.")
-        return JSONResponse(
-            content={"error": f"Invalid job_id '{job_id}'. Please upload and extract metadata first."},
-            status_code=404
-        )
+    job_id, job_dir = job.job_id, job.dir
 
     # 🔍 find metadata file
-    metadata_files = list(job_dir.glob("*_metadata.json"))
-    if not metadata_files:
+    metadata_path = job.metadata
+    if not metadata_path:
         # print(f"No metadata file found for job_id '{job_id}'.")
-        logger.warning(f"No metadata file found for job_id '{job_id}'.")
-        return JSONResponse(
+        logger.warning("No metadata file found for job_id '%s'.", job_id)
+        return ORJSONResponse(
             content={"error": "No metadata file found. Please run /upload_extract_metadata first."},
             status_code=404
         )
 
     # print("\nkeyword_string_generator started...")
-    logger.info(f"keyword_string_generator started for job_id: {job_id}")
+    logger.info("keyword_string_generator started for job_id: %s", job_id)
 
-    metadata_path = metadata_files[0]
     base_name = metadata_path.stem.replace("_metadata", "")
     keyword_string_path = job_dir / f"{base_name}_keywordstring.json"
-    logger.info(f"Metadata file: {metadata_path.name}, Keyword string file: {keyword_string_path.name}")
+    logger.info("Metadata file: %s, Keyword string file: %s", metadata_path.name, keyword_string_path.name)
 
     # Read base metadata
-    with open(metadata_path, "r", encoding="utf-8") as f:
-        input_data = json.load(f)
+    input_data = read_json(metadata_path)
     logger.info("Loaded metadata for keyword string generation")
 
     # Split and clean inputs
     primary_keywords = [kw.strip() for kw in primary_keywords_input.split(',') if kw.strip()]
     secondary_keywords = [kw.strip() for kw in secondary_keywords_input.split(',') if kw.strip()]
-    logger.info(f"Primary keywords input: {primary_keywords}")
-    logger.info(f"Secondary keywords input: {secondary_keywords}")
+    logger.info("Primary keywords input: %s", primary_keywords)
+    logger.info("Secondary keywords input: %s", secondary_keywords)
 
     # Function to make keyword group strings
     def build_string(keywords):
@@ -468,7 +772,7 @@ def keyword_string_generator(
         keyword_string = primary_str or secondary_str
 
     # print("\nkeyword string:\n", keyword_string)
-    logger.info(f"Generated keyword string: {keyword_string}")
+    logger.info("Generated keyword string: %s", keyword_string)
 
     # Prepare data to save
     keyword_string_json = {
@@ -479,19 +783,16 @@ def keyword_string_generator(
     }
 
     # Save as separate file
-    with open(keyword_string_path, "w", encoding="utf-8") as f:
-        json.dump(keyword_string_json, f, indent=2, ensure_ascii=False)
-    logger.info(f"Keyword string saved to file: {keyword_string_path.name}")
+    write_json(keyword_string_path, keyword_string_json)
+    logger.info("Keyword string saved to file: %s", keyword_string_path.name)
 
     # Update metadata as well
-    updated_data = input_data.copy()
-    updated_data.update(keyword_string_json)
+    input_data.update(keyword_string_json)
 
-    with open(metadata_path, "w", encoding="utf-8") as f:
-        json.dump(updated_data, f, indent=2, ensure_ascii=False)
-    logger.info(f"Metadata updated with keyword string: {metadata_path.name}\n")
+    write_json(metadata_path, input_data)
+    logger.info("Metadata updated with keyword string: %s\n", metadata_path.name)
 
-    return JSONResponse(content={
+    return ORJSONResponse(content={
         "message": f"Keyword string generated successfully for {base_name}.",
         "job_id": job_id,
         "metadata_file": metadata_path.name,
@@ -506,164 +807,128 @@ def keyword_string_generator(
 # 4️⃣ SEARCH DATABASES
 # -----------------------------------------------------------
 @app.post("/database_search")
-def database_search(
-        job_id: str = Query(..., description="Unique job ID folder name created during upload_extract_metadata"),
+async def database_search(
+        job: JobPaths = Depends(require_job),
         selected_websites: str = Form("PubMed,TandFonline,ScienceDirect,WileyLibrary")
 ):
     """
     Search selected databases using the keyword string from a specific job_id folder.
     """
 
-    job_dir = BASE_DIR / job_id
-    if not job_dir.exists():
-        # print(f"Invalid job_id '{job_id}'. Job folder does not exist.")
-        logger.error(f"Invalid job_id '{job_id}'. Job folder does not exist.")
-        return JSONResponse(
-            content={"error": f"Invalid job_id '{job_id}'. Please upload and extract metadata first."},
-            status_code=404
-        )
+    job_id, job_dir = job.job_id, job.dir
 
     # 🔍 find keyword string JSON
-    keyword_files = list(job_dir.glob("*_keywordstring.json"))
-    if not keyword_files:
+    keyword_path = job.keyword_string
+    if not keyword_path:
         # print(f"No keyword string found for job_id '{job_id}'.")
-        logger.warning(f"No keyword string found for job_id '{job_id}'. Run /keyword_string_generator first.")
-        return JSONResponse(
+        logger.warning("No keyword string found for job_id '%s'. Run /keyword_string_generator first.", job_id)
+        return ORJSONResponse(
             content={
                 "error": f"No keyword string found for job_id '{job_id}'. Please run /keyword_string_generator first."},
             status_code=404
         )
 
     # print("\n database_search started...")
-    logger.info(f"database_search started for job_id: {job_id}")
+    logger.info("database_search started for job_id: %s", job_id)
 
-    keyword_path = keyword_files[0]
     base_name = keyword_path.stem.replace("_keywordstring", "")
-    logger.info(f"Keyword string file: {keyword_path.name}")
+    logger.info("Keyword string file: %s", keyword_path.name)
 
     # Load keyword string
-    with open(keyword_path, "r", encoding="utf-8") as f:
-        keyword_data = json.load(f)
+    keyword_data = read_json(keyword_path)
     keyword_string = keyword_data.get("keyword_string", "")
-    logger.info(f"Loaded keyword string for job_id '{job_id}': {keyword_string}")
+    logger.info("Loaded keyword string for job_id '%s': %s", job_id, keyword_string)
 
     # Load metadata if needed
-    metadata_files = list(job_dir.glob("*_metadata.json"))
-    metadata_path = metadata_files[0] if metadata_files else None
+    metadata_path = job.metadata
     metadata_data = {}
     if metadata_path and metadata_path.exists():
-        with open(metadata_path, "r", encoding="utf-8") as f:
-            metadata_data = json.load(f)
-        logger.info(f"Loaded metadata file: {metadata_path.name}")
+        metadata_data = read_json(metadata_path)
+        logger.info("Loaded metadata file: %s", metadata_path.name)
 
     # Parse websites
     selected_websites_list = [w.strip() for w in selected_websites.split(',') if w.strip()]
-    logger.info(f"Selected websites for search: {selected_websites_list}")
+    logger.info("Selected websites for search: %s", selected_websites_list)
 
-    all_data_df = []
+    article_rows = []
     # print(f"Keyword string for job_id '{job_id}': {keyword_string}")
-    logger.info(f"Keyword string for job_id '{job_id}': {keyword_string}")
-
-    # --- Database queries ---
-    if 'ScienceDirect' in selected_websites_list:
-        # print("\nScienceDirect extraction\n")
-        logger.info("Starting ScienceDirect extraction")
-        sd = scrape_sciencedirect(keyword_string, max_articles=2)
-        sd_data = pd.DataFrame(sd)
-        if sd_data is not None and not sd_data.empty:
-            df_sd = pd.DataFrame(sd_data)
-            df_sd['Website'] = 'ScienceDirect'
-            all_data_df.append(df_sd)
-            logger.info(f"ScienceDirect: {len(df_sd)} articles found")
-
-    if 'TandFonline' in selected_websites_list:
-        # print("\nTandFonline extraction\n")
-        logger.info("Starting TandFonline extraction")
-        tf_data = search_tandfonline(keyword_string, max_results=2)
-        if isinstance(tf_data, list):
-            df_2 = pd.DataFrame(tf_data, columns=["Title", "Authors(potential reviewers)", "Emails",
-                                                  "Author_Email_Map", 'Author_with_Affiliation'])
+    logger.info("Keyword string for job_id '%s': %s", job_id, keyword_string)
+
+    # --- Database queries (run concurrently, each scraper in its own thread) ---
+    # Scraper modules are heavy, so each is only imported once its website is first searched
+    def run_sciencedirect():
+        from science_direct_new import scrape_sciencedirect
+        return scrape_sciencedirect(keyword_string, max_articles=2)
+
+    def run_tandfonline():
+        from tandfonline_new import search_tandfonline
+        return search_tandfonline(keyword_string, max_results=2)
+
+    def run_wiley():
+        from wiley_online_library_new import fetch_article_details
+        return fetch_article_details(keyword_string, max_articles=2)
+
+    def run_pubmed():
+        from pubmed_extraction_new import get_pubmed_data
+        return get_pubmed_data(keyword_string, num_articles=2)
+
+    scrapers = {
+        'ScienceDirect': run_sciencedirect,
+        'TandFonline': run_tandfonline,
+        'WileyLibrary': run_wiley,
+        'PubMed': run_pubmed,
+    }
+    websites = [website for website in scrapers if website in selected_websites_list]
+    logger.info("Starting extraction from: %s", websites)
+    results = await asyncio.gather(
+        *(asyncio.to_thread(scrapers[website]) for website in websites),
+        return_exceptions=True
+    )
+
+    for website, data in zip(websites, results):
+        if isinstance(data, Exception):
+            logger.error("%s extraction failed: %s", website, data)
+            continue
+        if website == 'TandFonline':
+            rows = to_article_rows(data if isinstance(data, list) else None, columns=ARTICLE_COLUMNS[:-1])
         else:
-            df_2 = pd.DataFrame(
-                columns=["Title", "Authors(potential reviewers)", "Emails", "Author_Email_Map",
-                         'Author_with_Affiliation'])
-        if df_2 is not None and not df_2.empty:
-            df_2['Website'] = 'TandFonline'
-            all_data_df.append(df_2)
-            logger.info(f"TandFonline: {len(df_2)} articles found")
-
-    if 'WileyLibrary' in selected_websites_list:
-        # print("\nWileyLibrary extraction\n")
-        logger.info("Starting WileyLibrary extraction")
-        wiley_df = fetch_article_details(keyword_string, max_articles=2)
-        if wiley_df is not None and not wiley_df.empty:
-            wiley_df['Website'] = 'WileyLibrary'
-            all_data_df.append(wiley_df)
-            logger.info(f"WileyLibrary: {len(wiley_df)} articles found")
-
-    if 'PubMed' in selected_websites_list:
-        # print("\nPubMed extraction\n")
-        logger.info("Starting PubMed extraction")
-        pubmed_df = get_pubmed_data(keyword_string, num_articles=2)
-        if pubmed_df is not None and not pubmed_df.empty:
-            pubmed_df['Website'] = 'PubMed'
-            all_data_df.append(pubmed_df)
-            logger.info(f"PubMed: {len(pubmed_df)} articles found")
+            rows = to_article_rows(data)
+        logger.info("%s: %s articles found", website, len(rows))
 
-    # Combine results
-    if all_data_df:
-        final_df = pd.concat(all_data_df, ignore_index=True)
-    else:
-        final_df = pd.DataFrame(columns=["Title", "Authors(potential reviewers)", "Emails",
-                                         "Author_Email_Map", "Author_with_Affiliation", "Website"])
-    logger.info(f"Total articles combined: {len(final_df)}")
+        # Keep only articles with both author maps filled in
+        for row in rows:
+            if row.get('Author_Email_Map') and row.get('Author_with_Affiliation'):
+                row['Website'] = website
+                article_rows.append(row)
 
-    # Filter valid entries
-    final_df = final_df[(final_df['Author_Email_Map'] != {}) & (final_df['Author_with_Affiliation'] != {})]
+    # Combine results
+    final_df = pd.DataFrame(article_rows) if article_rows else pd.DataFrame(columns=ARTICLE_COLUMNS)
+    logger.info("Total articles combined: %s", len(final_df))
 
-    # Extract author-email-affiliation rows
+    # Extract author-email-affiliation rows (one row per author of each article)
     records = []
-    for _, row in final_df.iterrows():
-        email_map = row['Author_Email_Map']
-        aff_map = row['Author_with_Affiliation']
-        if isinstance(email_map, str):
-            email_map = eval(email_map)
-        if isinstance(aff_map, str):
-            aff_map = eval(aff_map)
-
-        for author in email_map:
-            records.append({
-                "author": author,
-                "email": email_map.get(author, ""),
-                "aff": aff_map.get(author, "")
-            })
-
-    author_email_df = pd.DataFrame(records)
+    for row in article_rows:
+        email_map = parse_author_map(row['Author_Email_Map'])
+        aff_map = parse_author_map(row['Author_with_Affiliation'])
+        records.extend((author, email, aff_map.get(author, "")) for author, email in email_map.items())
+    author_email_df = pd.DataFrame(records, columns=["author", "email", "aff"])
     author_email_df.dropna(inplace=True)
-    author_email_df["city"] = author_email_df["aff"].apply(extract_city)
-    author_email_df["country"] = author_email_df["aff"].apply(extract_country)
 
-    DEGREE_WORDS = {
-        "MD", "PhD", "BD", "MS", "MSc", "BSc", "DDS", "DO", "DVM", "DrPH",
-        "MPH", "MBA", "EdD", "DPhil", "ScD", "DSc", "FRCP", "FRCS", "DPM"
-    }
-    pattern = r"\b(" + "|".join(map(re.escape, DEGREE_WORDS)) + r")\b"
-    author_email_df["author"] = (
-        author_email_df["author"]
-        .str.replace(pattern, "", regex=True)
-        .str.replace(r",", "", regex=True)
-        .str.replace(r"\s+", " ", regex=True)
-        .str.strip()
-    )
+    # Extract city/country once per distinct affiliation; institutions recur across authors
+    city_map, country_map = await asyncio.to_thread(locate_affiliations, author_email_df["aff"])
+    author_email_df["city"] = author_email_df["aff"].map(city_map)
+    author_email_df["country"] = author_email_df["aff"].map(country_map)
+
+    author_email_df["author"] = author_email_df["author"].map(clean_author_name)
 
     # Optional: save CSV in job folder
     final_df.to_csv(job_dir / "final_df.csv", index=False)
     final_df_1 = final_df[['Website', 'Authors(potential reviewers)', 'Emails', 'Title']]
     final_df_1.to_csv(job_dir / "final_df_1.csv", index=False)
     author_email_df.to_csv(job_dir / "author_email_df_before_val.csv", index=False)
-    logger.info(f"Saved final_df.csv, final_df_1.csv, author_email_df_before_val.csv in job folder: {job_dir}\n")
+    logger.info("Saved final_df.csv, final_df_1.csv, author_email_df_before_val.csv in job folder: %s\n", job_dir)
 
-    return JSONResponse(content={
+    return ORJSONResponse(content={
         "job_id": job_id,
         "keyword_string": keyword_string,
         "selected_websites": selected_websites_list,
@@ -676,80 +941,41 @@ def database_search(
 # -----------------------------------------------------------
 # 5️⃣ MANUAL AUTHOR ADDITION
 # -----------------------------------------------------------
-@app.post("/manual_authors")
-def manual_authors(
-        job_id: str = Query(..., description="Unique job ID"),
-        author_name: str = Form(..., description="Full name of the author to add")
-):
-    """
-    Add a manual author to the job's author_email_df and final_df_1.csv
-    """
-
-    job_dir = BASE_DIR / job_id
-    if not job_dir.exists():
-        # print(f"Invalid job_id '{job_id}'. Job folder does not exist.")
-        logger.error(f"Invalid job_id '{job_id}'. Job folder does not exist.")
-        return JSONResponse(
-            content={"error": f"Invalid job_id '{job_id}'. Please upload and extract metadata first."},
-            status_code=404
-        )
-
-    # print("\nmanual_authors started...")
-    logger.info(f"manual_authors started for job_id: {job_id}, author: {author_name}")
+# NCBI requests per manual author lookup (an ESearch for the author, then an EFetch of their latest record)
+MANUAL_LOOKUP_REQUESTS = 2
 
-    # Load author_email_df if exists, else create empty
-    author_email_df_path = job_dir / "author_email_df_before_val.csv"
-    if author_email_df_path.exists():
-        author_email_df = pd.read_csv(author_email_df_path)
-        logger.info(f"Loaded existing author_email_df from {author_email_df_path.name}")
-    else:
-        author_email_df = pd.DataFrame(columns=["author", "email", "aff", "city", "country"])
-        logger.info("No existing author_email_df found, created empty DataFrame")
 
-    # Search PubMed for author details
-    author_email = ""
-    author_affiliation = ""
-    
+def lookup_manual_author(author_name):
+    """
+    Search PubMed for an author and build their author_email_df row.
+    Returns None if the author is not found or has no email/affiliation,
+    and raises AuthorLookupError if the search failed.
+    """
     try:
         author_email, author_affiliation = search_pubmed_author(author_name)
-        logger.info(f"PubMed search result - email: {author_email}, affiliation: {author_affiliation}")
+        logger.info("PubMed search result - email: %s, affiliation: %s", author_email, author_affiliation)
+    except (NameError, ImportError):
+        # A missing helper is a deployment error, not an unknown author
+        raise
     except Exception as e:
-        logger.error(f"Error searching PubMed for author '{author_name}': {str(e)}")
-        # Instead of returning 500, return a 404 with author not found
-        return JSONResponse(
-            content={"error": f"Author '{author_name}' not found in PubMed database. Please check the spelling or try a different name."},
-            status_code=404
-        )
+        logger.error("Error searching PubMed for author '%s': %s", author_name, e)
+        raise AuthorLookupError(author_name) from e
 
     # Check if author was found
     if not author_email or not author_affiliation:
-        logger.warning(f"Author '{author_name}' not found or missing email/affiliation.")
-        return JSONResponse(
-            content={"error": f"Author '{author_name}' not found in PubMed database. Please check the spelling or try a different name."},
-            status_code=404
-        )
+        logger.warning("Author '%s' not found or missing email/affiliation.", author_name)
+        return None
 
     # Extract city and country, ensuring they are strings
     try:
-        city = extract_city(author_affiliation.strip())
-        country = extract_country(author_affiliation.strip())
-        
-        # Convert to string if they are sets or other non-string types
-        if isinstance(city, set):
-            city = ', '.join(city) if city else ""
-        elif not isinstance(city, str):
-            city = str(city) if city else ""
-        
-        if isinstance(country, set):
-            country = ', '.join(country) if country else ""
-        elif not isinstance(country, str):
-            country = str(country) if country else ""
+        city, country = extract_city_country(author_affiliation.strip())
+        city, country = location_text(city), location_text(country)
     except Exception as e:
-        logger.error(f"Error extracting city/country from affiliation: {str(e)}")
+        logger.error("Error extracting city/country from affiliation: %s", e)
         city = ""
         country = ""
-    
-    new_author = {
+
+    return {
         "author": author_name.strip(),
         "email": author_email.strip(),
         "aff": author_affiliation.strip(),
@@ -757,19 +983,72 @@ def manual_authors(
         "country": country
     }
 
+
+def add_manual_authors(job_dir, new_authors):
+    """
+    Append manually added author rows to the job's author_email_df_before_val.csv.
+    """
+    # Load author_email_df if exists, else create empty
+    author_email_df_path = job_dir / "author_email_df_before_val.csv"
+    if author_email_df_path.exists():
+        # Empty cells stay "" so a city/country that was extracted as empty is not mistaken for a missing one
+        author_email_df = pd.read_csv(author_email_df_path, keep_default_na=False)
+        logger.info("Loaded existing author_email_df from %s", author_email_df_path.name)
+    else:
+        author_email_df = pd.DataFrame(columns=["author", "email", "aff", "city", "country"])
+        logger.info("No existing author_email_df found, created empty DataFrame")
+
+    # All new rows are added with a single concat, so the frame is copied once per call
+    author_email_df = pd.concat([author_email_df, pd.DataFrame(new_authors)], ignore_index=True)
+
+    # New rows already carry city and country; only backfill rows that never had them computed
+    # (NaN, e.g. a file written before those columns existed)
+    has_aff = author_email_df["aff"].notna() & author_email_df["aff"].ne("")
+    missing = author_email_df[["city", "country"]].isna().any(axis=1) & has_aff
+    if missing.any():
+        city_map, country_map = locate_affiliations(author_email_df.loc[missing, "aff"])
+        author_email_df.loc[missing, "city"] = author_email_df.loc[missing, "aff"].map(city_map)
+        author_email_df.loc[missing, "country"] = author_email_df.loc[missing, "aff"].map(country_map)
+
+    author_email_df.to_csv(author_email_df_path, index=False)
+    return author_email_df_path
+
+
+@app.post("/manual_authors")
+def manual_authors(
+        job: JobPaths = Depends(require_job),
+        author_name: str = Form(..., description="Full name of the author to add")
+):
+    """
+    Add a manual author to the job's author_email_df and final_df_1.csv
+    """
+
+    job_id, job_dir = job.job_id, job.dir
+
+    # print("\nmanual_authors started...")
+    logger.info("manual_authors started for job_id: %s, author: %s", job_id, author_name)
+
+    # Search PubMed for author details
+    try:
+        new_author = lookup_manual_author(author_name)
+    except AuthorLookupError as e:
+        return ORJSONResponse(
+            content={"error": f"PubMed search failed for author '{author_name}': {e.__cause__}. Please try again."},
+            status_code=502
+        )
+    if new_author is None:
+        # Instead of returning 500, return a 404 with author not found
+        return ORJSONResponse(
+            content={"error": f"Author '{author_name}' not found in PubMed database. Please check the spelling or try a different name."},
+            status_code=404
+        )
+
     # Add to author_email_df
     try:
-        author_email_df = pd.concat([author_email_df, pd.DataFrame([new_author])], ignore_index=True)
-        author_email_df.dropna(inplace=True)
-        
-        # Ensure city and country columns are strings
-        author_email_df["city"] = author_email_df["aff"].apply(lambda x: str(extract_city(x)) if extract_city(x) else "")
-        author_email_df["country"] = author_email_df["aff"].apply(lambda x: str(extract_country(x)) if extract_country(x) else "")
-        
-        author_email_df.to_csv(author_email_df_path, index=False)
-        logger.info(f"Added author '{author_name}' to {author_email_df_path.name}\n")
-
-        return JSONResponse(
+        author_email_df_path = add_manual_authors(job_dir, [new_author])
+        logger.info("Added author '%s' to %s\n", author_name, author_email_df_path.name)
+
+        return ORJSONResponse(
             content={
                 "message": f"Author '{author_name}' added successfully.",
                 "job_id": job_id,
@@ -777,13 +1056,63 @@ def manual_authors(
             }
         )
     except Exception as e:
-        logger.error(f"Error adding author to CSV: {str(e)}")
-        return JSONResponse(
+        logger.error("Error adding author to CSV: %s", e)
+        return ORJSONResponse(
             content={"error": f"Failed to save author data: {str(e)}"},
             status_code=500
         )
 
 
+@app.post("/manual_authors_bulk")
+async def manual_authors_bulk(
+        job: JobPaths = Depends(require_job),
+        author_names: list[str] = Form(..., description="Full names of the authors to add")
+):
+    """
+    Add several manual authors at once. PubMed lookups run concurrently, their
+    requests paced by the same NCBI rate limiter /validate_authors uses.
+    """
+
+    job_id, job_dir = job.job_id, job.dir
+
+    names = list(dict.fromkeys(name.strip() for name in author_names if name.strip()))
+    logger.info("manual_authors_bulk started for job_id: %s, authors: %s", job_id, names)
+
+    async def lookup(author_name):
+        await LIMITER.wait(MANUAL_LOOKUP_REQUESTS)
+        return await asyncio.to_thread(lookup_manual_author, author_name)
+
+    results = await asyncio.gather(*(lookup(name) for name in names), return_exceptions=True)
+    for result in results:
+        # Only a failed search is reported per author; anything else is a server error
+        if isinstance(result, Exception) and not isinstance(result, AuthorLookupError):
+            raise result
+    added = [author for author in results if isinstance(author, dict)]
+    not_found = [name for name, author in zip(names, results) if author is None]
+    failed = [name for name, author in zip(names, results) if isinstance(author, AuthorLookupError)]
+
+    if added:
+        try:
+            author_email_df_path = await asyncio.to_thread(add_manual_authors, job_dir, added)
+            logger.info("Added %s authors to %s\n", len(added), author_email_df_path.name)
+        except Exception as e:
+            logger.error("Error adding authors to CSV: %s", e)
+            return ORJSONResponse(
+                content={"error": f"Failed to save author data: {str(e)}"},
+                status_code=500
+            )
+
+    return ORJSONResponse(
+        content={
+            "message": f"{len(added)} of {len(names)} authors added successfully.",
+            "job_id": job_id,
+            "authors_data": added,
+            "not_found": not_found,
+            "failed": failed
+        }
+    )
+
+
 # -----------------------------------------------------------
 # 6️⃣ VALIDATE AUTHORS
 # -----------------------------------------------------------
@@ -799,213 +1128,167 @@ def validate_authors(
     job_dir = BASE_DIR / job_id
     if not job_dir.exists():
         # print(f"Invalid job_id '{job_id}'")
-        logger.error(f"Invalid job_id '{job_id}'")
-        return JSONResponse(
+        logger.error("Invalid job_id '%s'", job_id)
+        return ORJSONResponse(
             content={"error": f"Invalid job_id '{job_id}'. Please run /database_search first."},
             status_code=404
         )
 
     # print("\nvalidate_authors started...")
-    logger.info(f"validate_authors started for job_id: {job_id}")
+    logger.info("validate_authors started for job_id: %s", job_id)
 
     # Load author_email_df_before_val
     author_email_df_path = job_dir / "author_email_df_before_val.csv"
     if not author_email_df_path.exists():
         # print("author_email_df_before_val.csv not found.")
         logger.error("author_email_df_before_val.csv not found.")
-        return JSONResponse(
+        return ORJSONResponse(
             content={"error": "No author_email_df_before_val.csv found. Please run /database_search first."},
             status_code=404
         )
 
     author_email_df = pd.read_csv(author_email_df_path)
-    logger.info(f"Loaded author_email_df_before_val.csv with {len(author_email_df)} authors")
+    logger.info("Loaded author_email_df_before_val.csv with %s authors", len(author_email_df))
 
     # Load keyword string
-    keyword_files = list(job_dir.glob("*_keywordstring.json"))
+    keyword_path = job_paths(job_id).keyword_string
     keyword_string = ""
-    if keyword_files:
-        with open(keyword_files[0], "r", encoding="utf-8") as f:
-            keyword_data = json.load(f)
-            keyword_string = keyword_data.get("keyword_string", "")
+    if keyword_path:
+        keyword_data = read_json(keyword_path)
+        keyword_string = keyword_data.get("keyword_string", "")
     # print("keyword_string: ", keyword_string)
-    logger.info(f"Loaded keyword string: {keyword_string}")
+    logger.info("Loaded keyword string: %s", keyword_string)
 
     # --- Compute publication stats ---
-    # print("\nGetting total no of publication from PubMed\n")
-    logger.info("Getting total no of publication from PubMed")
-    author_email_df["Total_Publications"] = author_email_df["author"].apply(lambda x: get_pubmed_count_selenium(x))
-
-    logger.info("Getting total no of first author publication from PubMed")
-    author_email_df["Total_Publications_first"] = author_email_df["author"].apply(lambda x: get_pubmed_count_selenium(x, role='first'))
-
-    logger.info("Getting total no of last author publication from PubMed")
-    author_email_df["Total_Publications_last"] = author_email_df["author"].apply(lambda x: get_pubmed_count_selenium(x, role='last'))
-
-    # print("\nGetting total no of publication from last 10 years from PubMed\n")
-    logger.info("Getting total no of publication from last 10 years from PubMed")
-    author_email_df["Publications_10_years"] = author_email_df["author"].apply(
-        lambda x: get_pubmed_count_selenium(x, last_n_years=10)
-    )
-
-    logger.info("Getting total no of first author publication from last 10 years from PubMed")
-    author_email_df["Publications_10_years_first"] = author_email_df["author"].apply(
-        lambda x: get_pubmed_count_selenium(x, last_n_years=10, role='first')
-    )
-
-    logger.info("Getting total no of last author publication from last 10 years from PubMed")
-    author_email_df["Publications_10_years_last"] = author_email_df["author"].apply(
-        lambda x: get_pubmed_count_selenium(x, last_n_years=10, role='last')
-    )
-
-    # print("\nGetting total no of publication from last 5 years from PubMed with keywords\n")
-    logger.info("Getting total no of publication from last 5 years from PubMed with keywords")
-    author_email_df["Publications_5_years"] = author_email_df["author"].apply(
-        lambda x: get_pubmed_count_selenium(x, last_n_years=5)
-    )
-
-    logger.info("Getting total no of first publication from last 5 years from PubMed with keywords")
-    author_email_df["Publications_5_years_first"] = author_email_df["author"].apply(
-        lambda x: get_pubmed_count_selenium(x, last_n_years=5, role='first')
-    )
-
-    logger.info("Getting total no of last publication from last 5 years from PubMed with keywords")
-    author_email_df["Publications_5_years_last"] = author_email_df["author"].apply(
-        lambda x: get_pubmed_count_selenium(x, last_n_years=5, role='last')
-    )
-
-    # print("\nGetting total no of publication from last 5 years from PubMed with keywords\n")
-    logger.info("Getting total no of relevant publication from last 5 years from PubMed with keywords")
-    author_email_df["Relevant_Publications_5_years"] = author_email_df["author"].apply(
-        lambda x: get_pubmed_count_selenium(x, last_n_years=5, keyword_string=keyword_string)
-    )
-
-    logger.info("Getting total no of relevant first publication from last 5 years from PubMed with keywords")
-    author_email_df["Relevant_Publications_5_years_first"] = author_email_df["author"].apply(
-        lambda x: get_pubmed_count_selenium(x, last_n_years=5, keyword_string=keyword_string, role='first')
-    )
-
-    logger.info("Getting total no of relevant last publication from last 5 years from PubMed with keywords")
-    author_email_df["Relevant_Publications_5_years_last"] = author_email_df["author"].apply(
-        lambda x: get_pubmed_count_selenium(x, last_n_years=5, keyword_string=keyword_string, role='last')
-    )
-
-    # print("\nGetting total no of publication from last 2 years from PubMed\n")
-    logger.info("Getting total no of publication from last 2 years from PubMed")
-    author_email_df["Publications_2_years)"] = author_email_df["author"].apply(
-        lambda x: get_pubmed_count_selenium(x, last_n_years=2)
-    )
-
-    logger.info("Getting total no of first publication from last 2 years from PubMed")
-    author_email_df["Publications_2_years_first)"] = author_email_df["author"].apply(
-        lambda x: get_pubmed_count_selenium(x, last_n_years=2, role='first')
-    )
-
-    logger.info("Getting total no of last publication from last 2 years from PubMed")
-    author_email_df["Publications_2_years_last)"] = author_email_df["author"].apply(
-        lambda x: get_pubmed_count_selenium(x, last_n_years=2, role='last')
-    )
-
-    # print("\nGetting total no of publication from last year from PubMed\n")
-    logger.info("Getting total no of publication from last year from PubMed")
-    author_email_df["Publications_last_year)"] = author_email_df["author"].apply(
-        lambda x: get_pubmed_count_selenium(x, last_n_years=1)
-    )
-
-    logger.info("Getting total no of first publication from last year from PubMed")
-    author_email_df["Publications_last_year_first)"] = author_email_df["author"].apply(
-        lambda x: get_pubmed_count_selenium(x, last_n_years=1, role='first')
-    )
-
-    logger.info("Getting total no of last publication from last year from PubMed")
-    author_email_df["Publications_last_year_last)"] = author_email_df["author"].apply(
-        lambda x: get_pubmed_count_selenium(x, last_n_years=1, role='last')
-    )
-
-    # print("\nGetting total no of clinical trials from last 2 years from PubMed\n")
-    logger.info("Getting total no of clinical trials from last 2 years from PubMed")
-    author_email_df["Clinical_Trials_no"] = author_email_df["author"].apply(
-        lambda x: clinical_trails_no(x, last_n_years=2)
-    )
-
-    # print("\nGetting total no of retracted publications from PubMed\n")
-    logger.info("Getting total no of retracted publications from PubMed")
-    author_email_df["Retracted_Pubs_no"] = author_email_df["author"].apply(
-        lambda x: pubmed_filtered_count(x, filter_label="Retracted Publication")
-    )
-
-    # print("\nGetting total no of clinical studies from last 2 years from PubMed\n")
-    logger.info("Getting total no of clinical studies from last 2 years from PubMed")
-    author_email_df["Clinical_study_no"] = author_email_df["author"].apply(
-        lambda x: pubmed_filtered_count(x, filter_label="Clinical Study", last_n_years=2)
-    )
+    # PubMed count columns, in output order, with the filters applied to each author's query
+    pubmed_metrics = {
+        "Total_Publications": {},
+        "Total_Publications_first": {"role": "first"},
+        "Total_Publications_last": {"role": "last"},
+        "Publications_10_years": {"last_n_years": 10},
+        "Publications_10_years_first": {"last_n_years": 10, "role": "first"},
+        "Publications_10_years_last": {"last_n_years": 10, "role": "last"},
+        "Publications_5_years": {"last_n_years": 5},
+        "Publications_5_years_first": {"last_n_years": 5, "role": "first"},
+        "Publications_5_years_last": {"last_n_years": 5, "role": "last"},
+        "Relevant_Publications_5_years": {"last_n_years": 5, "keyword_string": keyword_string},
+        "Relevant_Publications_5_years_first": {"last_n_years": 5, "keyword_string": keyword_string, "role": "first"},
+        "Relevant_Publications_5_years_last": {"last_n_years": 5, "keyword_string": keyword_string, "role": "last"},
+        "Publications_2_years)": {"last_n_years": 2},
+        "Publications_2_years_first)": {"last_n_years": 2, "role": "first"},
+        "Publications_2_years_last)": {"last_n_years": 2, "role": "last"},
+        "Publications_last_year)": {"last_n_years": 1},
+        "Publications_last_year_first)": {"last_n_years": 1, "role": "first"},
+        "Publications_last_year_last)": {"last_n_years": 1, "role": "last"},
+        "Clinical_Trials_no": {"filter_label": "Clinical Trial", "last_n_years": 2},
+        "Retracted_Pubs_no": {"filter_label": "Retracted Publication"},
+        "Clinical_study_no": {"filter_label": "Clinical Study", "last_n_years": 2},
+        "Case_reports_no": {"filter_label": "Case Reports", "last_n_years": 2},
+        "English_Pubs": {"language": "english"},
+    }
+    # Every lookup runs once per distinct author and is mapped back onto the rows
+    authors = author_email_df["author"].str.strip()
+    unique_authors = list(dict.fromkeys(authors))
+    metric_terms = {
+        column: {author: author_term(author, **filters) for author in unique_authors}
+        for column, filters in pubmed_metrics.items()
+    }
+    # One PMID set per author; two different authors coauthored if their sets intersect
+    author_terms = {author: author_term(author) for author in unique_authors}
 
-    # print("\nGetting total no of case reports from last 2 years from PubMed\n")
-    logger.info("Getting total no of case reports from last 2 years from PubMed")
-    author_email_df["Case_reports_no"] = author_email_df["author"].apply(
-        lambda x: pubmed_filtered_count(x, filter_label="Case Reports", last_n_years=2)
+    # Results saved by earlier runs of this job; only what is still missing is looked up again
+    cached_counts, cached_pmids, cached_tf_counts = (
+        load_job_cache(job_dir, name) for name in ("pubmed_counts", "pubmed_pmids", "tf_counts")
     )
+    count_terms = [term for terms in metric_terms.values() for term in terms.values() if term not in cached_counts]
+    pmid_terms = [term for term in author_terms.values() if term not in cached_pmids]
+    tf_authors = [author for author in unique_authors if author not in cached_tf_counts]
 
+    # PubMed counts, PMID sets and the T&F lookups are independent, so they all run at once
+    logger.info("Getting %s PubMed counts for %s authors (%s queries not cached)",
+                len(pubmed_metrics), len(unique_authors), len(count_terms))
     # print("\nGetting total no of T&F publications from last year\n")
     logger.info("Getting total no of T&F publications from last year")
-    author_email_df["TF_Publications_last_year"] = author_email_df["author"].apply(
-        lambda x: search_tandfonline_author(x, year_from="2024", year_to="2025")
+    # This endpoint runs in a worker thread; only the network lookups are handed to the event loop
+    new_counts, new_pmids, new_tf_counts = from_thread.run(fetch_validation_data, count_terms, pmid_terms, tf_authors)
+    counts = {**cached_counts, **new_counts}
+    pmids = {**cached_pmids, **new_pmids}
+    # Failed T&F searches (None) are left out of the cache so the next run retries them
+    tf_counts = {**cached_tf_counts, **{
+        author: count for author, count in zip(tf_authors, new_tf_counts) if count is not None
+    }}
+    save_job_cache(job_dir, "pubmed_counts", counts)
+    save_job_cache(job_dir, "pubmed_pmids", pmids)
+    save_job_cache(job_dir, "tf_counts", tf_counts)
+
+    # Lookups that failed stay missing (<NA>) rather than counting as 0, and are retried on the next run
+    failed_lookups = (
+        sum(term not in counts for terms in metric_terms.values() for term in terms.values())
+        + sum(term not in pmids for term in author_terms.values())
+        + sum(author not in tf_counts for author in unique_authors)
+    )
+    if failed_lookups:
+        logger.warning("%s lookups failed for job_id %s; their metrics are left empty", failed_lookups, job_id)
+    for column, terms in metric_terms.items():
+        author_email_df[column] = authors.map(
+            {author: counts.get(term) for author, term in terms.items()}
+        ).astype("Int64")
+    author_email_df.insert(
+        author_email_df.columns.get_loc("English_Pubs"),
+        "TF_Publications_last_year",
+        authors.map({author: tf_counts.get(author) for author in unique_authors}).astype("Int64")
     )
-
-    # print("\nGetting total no of english publications from PubMed\n")
-    logger.info("Getting total no of english publications from PubMed")
-    author_email_df["English_Pubs"] = author_email_df["author"].apply(lambda x: pubmed_english_count(x))
 
     # --- Coauthorship check ---
     # print("\nChecking coauthoring\n")
     logger.info("Checking coauthoring")
-    authors = author_email_df["author"].tolist()
-    coauthor_results = []
-    for idx, row in author_email_df.iterrows():
-        author_from_df = row['author'].strip()
-        coauthored_with_any = False
-        for ref_author in authors:
-            if check_coauthorship_selenium(author_from_df, ref_author.strip()):
-                # print(f"Checking coauthor: {ref_author.strip()}")
-                logger.info(f"Checking coauthor: {ref_author.strip()}")
-                coauthored_with_any = True
-                break
-        coauthor_results.append(coauthored_with_any)
-    author_email_df['coauthor'] = coauthor_results
+    # Authors whose PMID lookup failed are compared with no one, and their coauthor value stays unknown
+    known_authors = [author for author in unique_authors if author_terms[author] in pmids]
+    coauthored = dict(zip(known_authors, shares_pmids(
+        [pmids[author_terms[author]] for author in known_authors]
+    ).tolist()))
+    author_email_df['coauthor'] = authors.map({author: coauthored.get(author) for author in unique_authors})
+    logger.info("%s of %s authors have coauthored with another candidate", sum(coauthored.values()), len(coauthored))
 
     # --- Affiliation and Country Matching ---
     # print("\nChecking affiliation and country match\n")
     logger.info("Checking affiliation and country match")
     original_aff = author_email_df['aff'].tolist()
-    countries = country_extract(original_aff)
-    countries_list = json.loads(countries)
+    cached_countries = load_job_cache(job_dir, "countries")
+    if cached_countries.get("aff") == original_aff:
+        countries_list = cached_countries["countries"]
+    else:
+        countries = country_extract(original_aff)
+        countries_list = orjson.loads(countries)
+        save_job_cache(job_dir, "countries", {"aff": original_aff, "countries": countries_list})
     # print('\nOriginal country list: ', countries_list)
-    logger.info(f"Original country list: {countries_list}")
+    logger.info("Original country list: %s", countries_list)
     unique_countries_list = list(dict.fromkeys(countries_list))
 
-    author_email_df['country_match'] = author_email_df['aff'].apply(
-        lambda x: check_country_in_list(x, unique_countries_list)
-    )
-    author_email_df['aff_match'] = author_email_df['aff'].apply(lambda x: check_aff_match(x, original_aff))
+    # Authors from the same institution share an affiliation string, so match each distinct one once
+    unique_affs = list(dict.fromkeys(original_aff))
+    country_matches = {aff: check_country_in_list(aff, unique_countries_list) for aff in unique_affs}
+    author_email_df['country_match'] = author_email_df['aff'].map(country_matches)
+    aff_matches = {aff: check_aff_match(aff, original_aff) for aff in unique_affs}
+    author_email_df['aff_match'] = author_email_df['aff'].map(aff_matches)
 
     # --- Condition Columns ---
-    author_email_df['no_of_pub_condition_10_years'] = author_email_df['Publications_10_years'].apply(
-        lambda x: 1 if x >= 8 else 0
-    )
-    author_email_df['no_of_pub_condition_5_years'] = author_email_df['Relevant_Publications_5_years'].apply(
-        lambda x: 1 if x >= 3 else 0
-    )
-    author_email_df['no_of_pub_condition_2_years'] = author_email_df['Publications_2_years)'].apply(
-        lambda x: 1 if x >= 1 else 0
-    )
-    author_email_df['english_condition'] = (
-        (author_email_df['Total_Publications'] > 0) &
-        ((author_email_df['English_Pubs'] / author_email_df['Total_Publications']) > 0.5)
-    ).astype(int)
-    author_email_df['coauthor_condition'] = author_email_df['coauthor'].apply(lambda x: 1 if not x else 0)
-    author_email_df['aff_condition'] = author_email_df['aff_match'].apply(lambda x: 1 if x == "NO" else 0)
-    author_email_df['country_match_condition'] = author_email_df['country_match'].apply(lambda x: 1 if x == "YES" else 0)
-    author_email_df['retracted_condition'] = author_email_df['Retracted_Pubs_no'].apply(lambda x: 1 if x > 1 else 0)
+    # Each condition is a 0/1 flag, stored as int8
+    def metric(column):
+        # A failed lookup is NaN here, which fails every comparison, so it never earns a condition
+        return author_email_df[column].to_numpy(dtype=float, na_value=np.nan)
+
+    author_email_df['no_of_pub_condition_10_years'] = (metric('Publications_10_years') >= 8).astype(np.int8)
+    author_email_df['no_of_pub_condition_5_years'] = (metric('Relevant_Publications_5_years') >= 3).astype(np.int8)
+    author_email_df['no_of_pub_condition_2_years'] = (metric('Publications_2_years)') >= 1).astype(np.int8)
+    total_pubs = metric('Total_Publications')
+    english_pubs = metric('English_Pubs')
+    english_share = np.divide(english_pubs, total_pubs, out=np.full_like(total_pubs, np.nan), where=total_pubs > 0)
+    author_email_df['english_condition'] = (english_share > 0.5).astype(np.int8)
+    author_email_df['coauthor_condition'] = author_email_df['coauthor'].eq(False).astype(np.int8)
+    author_email_df['aff_condition'] = author_email_df['aff_match'].eq("NO").astype(np.int8)
+    author_email_df['country_match_condition'] = author_email_df['country_match'].eq("YES").astype(np.int8)
+    author_email_df['retracted_condition'] = (metric('Retracted_Pubs_no') > 1).astype(np.int8)
 
     # --- Scoring ---
     author_email_df['conditions_met'] = (
@@ -1013,7 +1296,7 @@ def validate_authors(
             ['no_of_pub_condition_10_years', 'english_condition', 'coauthor_condition', 'aff_condition',
              'country_match_condition', 'no_of_pub_condition_5_years', 'no_of_pub_condition_2_years',
              'retracted_condition']
-        ].sum(axis=1)
+        ].to_numpy(dtype=np.int8).sum(axis=1, dtype=np.int16)
     )
     author_email_df['conditions_satisfied'] = author_email_df['conditions_met'].astype(str) + ' of 8'
     author_email_df = author_email_df.sort_values(by='conditions_met', ascending=False)
@@ -1022,31 +1305,33 @@ def validate_authors(
     after_val_path = job_dir / "author_email_df_after_val.csv"
     final_authors_path = job_dir / "Final_authors.csv"
     display_path = job_dir / "Final_authors_display.csv"
+    reviewers_json_path = job_dir / "Final_authors.json"
 
-    author_email_df.to_csv(after_val_path, index=False)
+    # The frame is only read while the output files are written, so they are written concurrently
     author_email_df.rename(columns={'author': 'reviewer'}, inplace=True)
-    author_email_df.to_csv(final_authors_path, index=False)
-
-    author_email_df_display = author_email_df[
-        ['reviewer', 'email', 'aff', 'country', 'Total_Publications', 'English_Pubs',
-         'Publications_10_years', 'Relevant_Publications_5_years',
-         'Publications_2_years)', 'Publications_last_year', 'Clinical_Trials_no', 'Clinical_study_no',
-         'Case_reports_no', 'Retracted_Pubs_no', 'TF_Publications_last_year', 'coauthor',
-         'country_match', 'aff_match', 'no_of_pub_condition_10_years', 'no_of_pub_condition_5_years',
-         'no_of_pub_condition_2_years', 'english_condition', 'coauthor_condition', 'aff_condition',
-         'country_match_condition', 'retracted_condition', 'conditions_met', 'conditions_satisfied']
-    ]
-    author_email_df_display.to_csv(display_path, index=False)
+    after_val_header = ['author' if column == 'reviewer' else column for column in author_email_df.columns]
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        writes = [
+            executor.submit(author_email_df.to_csv, after_val_path, index=False, header=after_val_header,
+                            chunksize=CSV_CHUNK_SIZE),
+            executor.submit(author_email_df.to_csv, final_authors_path, index=False, chunksize=CSV_CHUNK_SIZE),
+            executor.submit(author_email_df.to_csv, display_path, index=False, columns=REVIEWER_DISPLAY_COLUMNS,
+                            chunksize=CSV_CHUNK_SIZE),
+            executor.submit(write_reviewers_json, reviewers_json_path, job_id, author_email_df)
+        ]
+        for write in writes:
+            write.result()
 
     # print(f"\nSaved validated author data in: {after_val_path}, {final_authors_path}, {display_path}")
-    logger.info(f"Saved validated author data in: {after_val_path}, {final_authors_path}, {display_path}")
-    logger.info(f"Validation complete for job_id: {job_id}\n")
+    logger.info("Saved validated author data in: %s, %s, %s", after_val_path, final_authors_path, display_path)
+    logger.info("Validation complete for job_id: %s\n", job_id)
 
-    return JSONResponse(content={
+    return ORJSONResponse(content={
         "message": f"Author validation and scoring completed successfully for job_id '{job_id}'.",
         "job_id": job_id,
         "total_authors": len(author_email_df),
-        "top_5_preview": author_email_df_display.head(5).to_dict(orient="records")
+        "failed_lookups": failed_lookups,
+        "top_5_preview": reviewer_records(author_email_df.head(5)[REVIEWER_DISPLAY_COLUMNS])
     })
 
 
@@ -1054,42 +1339,39 @@ def validate_authors(
 # 7️⃣ RECOMMENDED REVIEWERS
 # -----------------------------------------------------------
 @app.get("/recommended_reviewers")
-def recommended_reviewers(job_id: str = Query(..., description="Unique job ID")):
+def recommended_reviewers(job: JobPaths = Depends(require_job)):
     """
     Fetch and return the list of recommended reviewers (authors) and their evaluation details.
     """
+    job_id, job_dir = job.job_id, job.dir
     # print(f"\nFetching recommended reviewers for job_id: {job_id}")
-    logger.info(f"Fetching recommended reviewers for job_id: {job_id}")
-    job_dir = BASE_DIR / job_id
-
-    if not job_dir.exists():
-        # print("❌ Job directory not found.")
-        logger.info(f"Job directory not found.")
-        return JSONResponse(
-            content={"error": f"Invalid job_id '{job_id}'. Please upload and process metadata first."},
-            status_code=404
-        )
+    logger.info("Fetching recommended reviewers for job_id: %s", job_id)
 
     final_authors_path = job_dir / "Final_authors.csv"
+    reviewers_json_path = job_dir / "Final_authors.json"
+
+    # Response body pre-rendered by /validate_authors
+    if reviewers_json_path.exists():
+        logger.info("Recommended reviewers successful for job_id: %s", job_id)
+        return FileResponse(reviewers_json_path, media_type="application/json")
 
     if not final_authors_path.exists():
         # print("❌ Final_authors.csv not found.")
-        logger.info(f"Final_authors.csv not found.")
-        return JSONResponse(
+        logger.info("Final_authors.csv not found.")
+        return ORJSONResponse(
             content={"error": f"No reviewer data found for job_id '{job_id}'. Please run the validation first."},
             status_code=404
         )
 
+    # Jobs validated before Final_authors.json existed
     # print("✅ Loading Final_authors.csv...")
     author_email_df = pd.read_csv(final_authors_path)
-
-    # Convert DataFrame to JSON
-    data = json.loads(author_email_df.to_json(orient="records"))
+    data = author_email_df.to_dict(orient="records")
 
     # print("✅ Returning reviewer data as JSON response.")
-    logger.info(f"Recommended reviewers successful for job_id: {job_id}")
+    logger.info("Recommended reviewers successful for job_id: %s", job_id)
 
-    return JSONResponse(
+    return ORJSONResponse(
         content={
             "job_id": job_id,
             "reviewer_count": len(author_email_df),
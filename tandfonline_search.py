@@ -0,0 +1,103 @@
+import re
+import asyncio
+import logging
+import httpx
+
+logger = logging.getLogger("scholarfinder_logger")
+
+SEARCH_URL = "https://www.tandfonline.com/action/doSearch"
+
+# T&F rejects requests without a browser-like User-Agent
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+                  "(KHTML, like Gecko) Chrome/124.0 Safari/537.36",
+    "Accept": "text/html,application/xhtml+xml",
+    "Accept-Language": "en-US,en;q=0.9",
+}
+
+# Result total in the search page header, e.g. <span class="search-result__count">1,234</span>
+RESULT_COUNT_PATTERN = re.compile(r'class="[^"]*result[_-]+count[^"]*"[^>]*>\s*([\d,]+)')
+
+# Concurrent HTTP searches, and concurrent Selenium fallbacks (each one drives a browser)
+MAX_CONCURRENT_SEARCHES = 8
+MAX_CONCURRENT_BROWSERS = 4
+
+SEARCH_SEMAPHORE = asyncio.Semaphore(MAX_CONCURRENT_SEARCHES)
+BROWSER_SEMAPHORE = asyncio.Semaphore(MAX_CONCURRENT_BROWSERS)
+HTTP_CLIENT = None
+
+
+class SearchBlocked(Exception):
+    """
+    T&F answered with a page that has no result count, e.g. a bot challenge.
+    """
+
+
+def get_client():
+    """
+    The shared AsyncClient, created on first use.
+    """
+    global HTTP_CLIENT
+    if HTTP_CLIENT is None or HTTP_CLIENT.is_closed:
+        HTTP_CLIENT = httpx.AsyncClient(headers=HEADERS, timeout=20, follow_redirects=True)
+    return HTTP_CLIENT
+
+
+async def close_tf_client():
+    """
+    Close the shared AsyncClient; called on server shutdown.
+    """
+    if HTTP_CLIENT is not None:
+        await HTTP_CLIENT.aclose()
+
+
+def parse_result_count(html):
+    """
+    Read the result total from a T&F search page. Any page without one, including a
+    genuine empty result, raises SearchBlocked so the Selenium search decides instead.
+    """
+    match = RESULT_COUNT_PATTERN.search(html)
+    if not match:
+        raise SearchBlocked("no result count in search page")
+    return int(match.group(1).replace(",", ""))
+
+
+async def fetch_publication_count(author, year_from, year_to):
+    """
+    Number of T&F publications with author as a contributor, published between year_from and year_to.
+    """
+    params = {
+        "field1": "Contrib",
+        "text1": author.strip(),
+        "AfterYear": year_from,
+        "BeforeYear": year_to,
+        "startPage": 0,
+        "pageSize": 1,
+    }
+    async with SEARCH_SEMAPHORE:
+        response = await get_client().get(SEARCH_URL, params=params)
+    response.raise_for_status()
+    return parse_result_count(response.text)
+
+
+async def tf_publication_counts(authors, year_from, year_to):
+    """
+    Number of T&F publications per author between year_from and year_to, or None for an author
+    whose search failed. Searches over plain HTTP and falls back to the Selenium search for authors T&F blocks.
+    """
+
+    async def count(author):
+        try:
+            return await fetch_publication_count(author, year_from, year_to)
+        except (httpx.HTTPError, SearchBlocked) as e:
+            logger.warning("T&F HTTP search failed for '%s' (%s), falling back to Selenium", author, e)
+        # Selenium is only loaded once a fallback is actually needed
+        from tandfonline_author_pub_last_year import search_tandfonline_author
+        async with BROWSER_SEMAPHORE:
+            try:
+                return await asyncio.to_thread(search_tandfonline_author, author, year_from=year_from, year_to=year_to)
+            except Exception as e:
+                logger.error("T&F Selenium search failed for '%s': %s", author, e)
+                return None
+
+    return await asyncio.gather(*(count(author) for author in authors))